@@ -1,4 +1,8 @@
 import os
+import queue
+import ssl
+import sys
+import tempfile
 import wave
 
 import numpy as np
@@ -12,24 +16,151 @@ import websocket
 import uuid
 import time
 
+# ANSI escape sequence that clears the terminal and moves the cursor home.
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+def _enable_ansi_escapes():
+    """
+    Turn on virtual terminal processing for the Windows console so ANSI escapes are honoured.
+    """
+    if os.name != "nt":
+        return
+    import ctypes
+
+    kernel32 = ctypes.windll.kernel32
+    stdout_handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    console_mode = ctypes.c_uint32()
+    if kernel32.GetConsoleMode(stdout_handle, ctypes.byref(console_mode)):
+        kernel32.SetConsoleMode(stdout_handle, console_mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+_enable_ansi_escapes()
+
+# PortAudio is initialized once and shared by every Client in the process.
+_pyaudio_instance = None
+_pyaudio_refcount = 0
+_pyaudio_lock = threading.Lock()
+
+def _acquire_pyaudio():
+    """
+    Return the shared PyAudio instance, initializing PortAudio on first use.
+    """
+    global _pyaudio_instance, _pyaudio_refcount
+    with _pyaudio_lock:
+        if _pyaudio_instance is None:
+            _pyaudio_instance = pyaudio.PyAudio()
+        _pyaudio_refcount += 1
+        return _pyaudio_instance
+
+def _release_pyaudio():
+    """
+    Release a reference to the shared PyAudio instance, terminating PortAudio
+    once no client uses it anymore.
+    """
+    global _pyaudio_instance, _pyaudio_refcount
+    with _pyaudio_lock:
+        if _pyaudio_instance is None:
+            return
+        _pyaudio_refcount -= 1
+        if _pyaudio_refcount <= 0:
+            _pyaudio_instance.terminate()
+            _pyaudio_instance = None
+            _pyaudio_refcount = 0
+
+# One TLS context, and its loaded CA bundle, is shared by every WebSocket connection.
+_ssl_context = None
+_ssl_context_lock = threading.Lock()
+
+def _get_ssl_context():
+    """
+    Return the shared TLS context, creating it on first use.
+    """
+    global _ssl_context
+    with _ssl_context_lock:
+        if _ssl_context is None:
+            # Honour the CA bundle override websocket-client applies when it builds its own context
+            ca_bundle = os.environ.get("WEBSOCKET_CLIENT_CA_BUNDLE")
+            if ca_bundle and os.path.isfile(ca_bundle):
+                _ssl_context = ssl.create_default_context(cafile=ca_bundle)
+            elif ca_bundle and os.path.isdir(ca_bundle):
+                _ssl_context = ssl.create_default_context(capath=ca_bundle)
+            else:
+                _ssl_context = ssl.create_default_context()
+        return _ssl_context
+
+def _resample_source_stamp(input_file: str, sample_rate: int):
+    """
+    Describe the input file and sample rate a resampled copy is produced from.
+    """
+    input_stat = os.stat(input_file)
+    return {
+        "source": os.path.abspath(input_file),
+        "size": input_stat.st_size,
+        "mtime_ns": input_stat.st_mtime_ns,
+        "sample_rate": sample_rate,
+    }
+
+def _is_resampled_copy_current(input_file: str, modified_audio_file: str, sample_rate: int):
+    """
+    Check whether a resampled copy of an audio file can be reused as is.
+
+    The copy is reused only if its sidecar stamp matches the current input file and sample rate,
+    and its header is 16-bit mono at that rate.
+    """
+    try:
+        with open(f"{modified_audio_file}.source.json") as stamp_file:
+            if json.load(stamp_file) != _resample_source_stamp(input_file, sample_rate):
+                return False
+        with wave.open(modified_audio_file, "rb") as wav_in:
+            return (
+                wav_in.getframerate() == sample_rate
+                and wav_in.getnchannels() == 1
+                and wav_in.getsampwidth() == 2
+            )
+    except (OSError, ValueError, EOFError, wave.Error):
+        return False
+
 def resample_audio(input_file: str, new_sample_rate: int = 16000):
     """
     Open an audio file, read it as mono waveform, resample if needed,
     and save the modified audio file.
+
+    A previously written modified file is reused when its sidecar stamp shows it
+    was produced from the same, unchanged input file at the requested sample rate.
     """
+    modified_audio_file = f"{os.path.splitext(input_file)[0]}_modified.wav"
+    stamp_file_name = f"{modified_audio_file}.source.json"
+    if _is_resampled_copy_current(input_file, modified_audio_file, new_sample_rate):
+        return modified_audio_file
+
+    # Stamp the input as it is before decoding, so a change made mid-decode is caught next time
+    source_stamp = _resample_source_stamp(input_file, new_sample_rate)
+    # Invalidate the old stamp before the copy it describes is overwritten
+    if os.path.exists(stamp_file_name):
+        os.remove(stamp_file_name)
+    # Decode into a temporary file next to the output so a failed or interrupted run never
+    # leaves a truncated copy in place. Only the unique name is reserved; the placeholder is
+    # removed so ffmpeg creates the file itself with the usual umask permissions.
+    temp_fd, temp_audio_file = tempfile.mkstemp(
+        suffix=".wav", prefix=".resample-", dir=os.path.dirname(os.path.abspath(modified_audio_file))
+    )
+    os.close(temp_fd)
+    os.remove(temp_audio_file)
     try:
-        # Use ffmpeg to decode audio with resampling
-        output, _ = (
+        # Use ffmpeg to decode audio with resampling into the temporary WAV file
+        (
             ffmpeg.input(input_file, threads=0)
-            .output("-", format="s16le", acodec="pcm_s16le", ac=1, ar=new_sample_rate)
+            .output(temp_audio_file, format="wav", acodec="pcm_s16le", ac=1, ar=new_sample_rate)
+            .overwrite_output()
             .run(cmd=["ffmpeg", "-nostdin"], capture_stdout=True, capture_stderr=True)
         )
+        os.replace(temp_audio_file, modified_audio_file)
     except ffmpeg.Error as e:
         raise RuntimeError(f"Error loading audio: {e.stderr.decode()}") from e
-    np_audio_buffer = np.frombuffer(output, dtype=np.int16)
-
-    modified_audio_file = f"{input_file.split('.')[0]}_modified.wav"
-    scipy.io.wavfile.write(modified_audio_file, new_sample_rate, np_audio_buffer.astype(np.int16))
+    finally:
+        if os.path.exists(temp_audio_file):
+            os.remove(temp_audio_file)
+    with open(stamp_file_name, "w") as stamp_file:
+        json.dump(source_stamp, stamp_file)
     return modified_audio_file
 
 class Client:
@@ -43,6 +174,8 @@ class Client:
         Initialize an AudioClient instance for recording and streaming audio.
         """
         self.audio_chunk_size = 1024
+        self.send_coalesce_chunks = 4
+        self.float_audio_buffer = np.empty(self.audio_chunk_size * self.send_coalesce_chunks, dtype=np.float32)
         self.audio_format = pyaudio.paInt16
         self.audio_channels = 1
         self.audio_rate = 16000
@@ -53,13 +186,26 @@ class Client:
         self.language = language
         self.task = "translate" if translate else "transcribe"
         self.session_id = str(uuid.uuid4())
+        self.auth_message = json.dumps(
+            {
+                "uid": self.session_id,
+                "multilingual": self.multilingual,
+                "language": self.language,
+                "task": self.task,
+                "auth": self.api_key
+            }
+        )
         self.is_waiting = False
+        self.ready_event = threading.Event()
+        self.wait_event = threading.Event()
+        self.closed_event = threading.Event()
         self.last_server_response_time = None
         self.timeout_duration = 30
         self.time_offset = 0.0
         self.audio_data = None
         self.record_seconds = 60000
-        self.pyaudio_instance = pyaudio.PyAudio()
+        self.text_wrapper = textwrap.TextWrapper(width=60)
+        self.pyaudio_instance = _acquire_pyaudio()
         self.audio_stream = self.pyaudio_instance.open(
             format=self.audio_format,
             channels=self.audio_channels,
@@ -84,11 +230,20 @@ class Client:
         Client.SESSIONS[self.session_id] = self
 
         # Start WebSocket thread
-        self.websocket_thread = threading.Thread(target=self.websocket_client.run_forever)
-        self.websocket_thread.setDaemon(True)
+        run_forever_options = {"skip_utf8_validation": True}
+        if websocket_url.startswith("wss://"):
+            run_forever_options["sslopt"] = {"context": _get_ssl_context()}
+        self.websocket_thread = threading.Thread(
+            target=self.websocket_client.run_forever,
+            kwargs=run_forever_options,
+            daemon=True,
+        )
         self.websocket_thread.start()
 
-        self.recorded_frames = b""
+        self.recorded_frames = []
+        self.recorded_frames_len = 0
+        self.write_queue = None
+        self.writer_thread = None
         print("[INFO]: * Starting recording")
 
     def write_audio_frames_to_file(self, frames, file_name):
@@ -103,12 +258,31 @@ class Client:
             file_name (str): The name of the WAV file to which the frames will be written.
 
         """
-        with wave.open(file_name, "wb") as wavfile:
-            wavfile: wave.Wave_write
-            wavfile.setnchannels(self.audio_channels)
-            wavfile.setsampwidth(2)
-            wavfile.setframerate(self.audio_rate)
-            wavfile.writeframes(frames)
+        audio_samples = np.frombuffer(frames, dtype=np.int16).reshape(-1, self.audio_channels)
+        scipy.io.wavfile.write(file_name, self.audio_rate, audio_samples)
+
+    def start_audio_writer(self):
+        """
+        Start the thread that writes recorded audio chunks to disk, if it is not running yet.
+        """
+        if self.writer_thread is not None:
+            return
+        self.write_queue = queue.Queue(maxsize=4)
+        self.writer_thread = threading.Thread(target=self.audio_writer_loop, daemon=True)
+        self.writer_thread.start()
+
+    def audio_writer_loop(self):
+        """
+        Write queued audio chunks to WAV files, one at a time, until the process exits.
+        """
+        while True:
+            frames, file_name = self.write_queue.get()
+            try:
+                self.write_audio_frames_to_file(frames, file_name)
+            except Exception as e:
+                print(f"[ERROR]: Failed to write {file_name}: {e}")
+            finally:
+                self.write_queue.task_done()
 
     def multicast_packet(self, packet, unconditional=False):
         """
@@ -157,13 +331,26 @@ class Client:
                 os.remove(in_file)
         wavfile.close()
 
+    def send_pending_audio(self, pending_audio):
+        """
+        Convert coalesced audio chunks to float32, send them as one packet and empty the buffer.
+
+        Args:
+            pending_audio (bytearray): Raw int16 audio waiting to be sent. Cleared after sending.
+        """
+        if not pending_audio:
+            return
+        self.multicast_packet(self.convert_bytes_to_float(pending_audio).tobytes())
+        pending_audio.clear()
+
     def record(self, out_file="output_recording.wav"):
         """
         Record audio data from the input stream and save it to a WAV file.
 
         Continuously records audio data from the input stream, sends it to the server via a WebSocket
-        connection, and simultaneously saves it to multiple WAV files in chunks. It stops recording when
-        the `RECORD_SECONDS` duration is reached or when the `RECORDING` flag is set to `False`.
+        connection in frames of `send_coalesce_chunks` audio chunks, and simultaneously saves it to
+        multiple WAV files in chunks. It stops recording when the `RECORD_SECONDS` duration is reached
+        or when the `RECORDING` flag is set to `False`.
 
         Audio data is saved in chunks to the "chunks" directory. Each chunk is saved as a separate WAV file.
         The recording will continue until the specified duration is reached or until the `RECORDING` flag is set to `False`.
@@ -176,42 +363,42 @@ class Client:
 
         """
         n_audio_file = 0
+        pending_audio = bytearray()
+        send_threshold = self.audio_chunk_size * self.send_coalesce_chunks * 2
         if not os.path.exists("chunks"):
             os.makedirs("chunks", exist_ok=True)
+        self.start_audio_writer()
         try:
             for _ in range(0, int(self.audio_rate / self.audio_chunk_size * self.record_seconds)):
                 # if not any(client.recording for client in self.clients):
                 #     break
                 data = self.audio_stream.read(self.audio_chunk_size, exception_on_overflow=False)
-                self.recorded_frames += data
-
-                audio_array = self.convert_bytes_to_float(data)
+                self.recorded_frames.append(data)
+                self.recorded_frames_len += len(data)
 
-                self.multicast_packet(audio_array.tobytes())
+                # coalesce several chunks into one WebSocket frame
+                pending_audio += data
+                if len(pending_audio) >= send_threshold:
+                    self.send_pending_audio(pending_audio)
 
                 # save recorded_frames if more than a minute
-                if len(self.recorded_frames) > 60 * self.audio_rate:
-                    t = threading.Thread(
-                        target=self.write_audio_frames_to_file,
-                        args=(
-                            self.recorded_frames[:],
-                            f"chunks/{n_audio_file}.wav",
-                        ),
-                    )
-                    t.start()
+                if self.recorded_frames_len > 60 * self.audio_rate:
+                    self.write_queue.put((b"".join(self.recorded_frames), f"chunks/{n_audio_file}.wav"))
                     n_audio_file += 1
-                    self.recorded_frames = b""
+                    self.recorded_frames = []
+                    self.recorded_frames_len = 0
+            self.send_pending_audio(pending_audio)
             # self.write_all_clients_srt()
 
         except KeyboardInterrupt:
-            if len(self.recorded_frames):
-                self.write_audio_frames_to_file(
-                    self.recorded_frames[:], f"chunks/{n_audio_file}.wav"
-                )
+            self.send_pending_audio(pending_audio)
+            if self.recorded_frames_len:
+                self.write_queue.put((b"".join(self.recorded_frames), f"chunks/{n_audio_file}.wav"))
                 n_audio_file += 1
+            self.write_queue.join()
             self.audio_stream.stop_stream()
             self.audio_stream.close()
-            self.pyaudio_instance.terminate()
+            _release_pyaudio()
             self.close_websocket_connection()
 
             self.write_output_recording(n_audio_file, out_file)
@@ -220,24 +407,32 @@ class Client:
     def on_message(self, ws, message):
         """
         Processes messages received from the server.
+
+        The WebSocket loop runs with `skip_utf8_validation=True`, so text frames are not decoded and
+        `message` arrives as UTF-8 encoded JSON `bytes` rather than `str`; `json.loads` accepts either.
         """
-        self.last_server_response_time = time.time()
+        self.last_server_response_time = time.perf_counter()
         server_message = json.loads(message)
 
-        if self.session_id != server_message.get("session_id"):
+        session_id = server_message.get("session_id")
+        if self.session_id != session_id:
             # print("[ERROR]: Mismatched session ID")
-            self.session_id = server_message.get("session_id")
+            self.session_id = session_id
 
-        if "status" in server_message and server_message["status"] == "WAIT":
+        if server_message.get("status") == "WAIT":
             self.is_waiting = True
+            self.wait_event.set()
             print(f"[INFO]: Server busy. Estimated wait: {round(server_message['info'])} minutes.")
 
-        if "message" in server_message and server_message["message"] == "DISCONNECT":
+        control_message = server_message.get("message")
+        if control_message == "DISCONNECT":
             print("[INFO]: Server initiated disconnect.")
             self.is_recording = False
+            self.closed_event.set()
 
-        if "message" in server_message and server_message["message"] == "SERVER_READY":
+        if control_message == "SERVER_READY":
             self.is_recording = True
+            self.ready_event.set()
             return
 
         if "language" in server_message:
@@ -246,10 +441,10 @@ class Client:
             print(f"[INFO]: Detected language {self.selected_language} with confidence {language_confidence}")
             return
 
-        if "segments" not in server_message:
+        transcript_segments = server_message.get("segments")
+        if transcript_segments is None:
             return
 
-        transcript_segments = server_message["segments"]
         transcript = []
         if len(transcript_segments):
             for segment in transcript_segments:
@@ -258,45 +453,37 @@ class Client:
                 transcript.append(segment["text"])
         if len(transcript) > 3:
             transcript = transcript[-3:]
-        text_wrapper = textwrap.TextWrapper(width=60)
-        wrapped_text = text_wrapper.wrap(text="".join(transcript))
-        if os.name == "nt":
-            os.system("cls")
-        else:
-            os.system("clear")
-        for line in wrapped_text:
-            print(line)
+        wrapped_text = self.text_wrapper.wrap(text="".join(transcript))
+        sys.stdout.write(CLEAR_SCREEN + "\n".join(wrapped_text) + "\n")
+        sys.stdout.flush()
 
     def on_error(self, ws, error):
         print(f"[ERROR]: WebSocket error: {error}")
 
     def on_close(self, ws, status_code, msg):
         print(f"[INFO]: WebSocket closed with status {status_code}: {msg}")
+        self.closed_event.set()
 
     def on_open(self, ws):
         """
         Handles the WebSocket connection opening.
         """
         print(f"[INFO]: Connection established")
-        ws.send(
-            json.dumps(
-                {
-                    "uid": self.session_id,
-                    "multilingual": self.multilingual,
-                    "language": self.language,
-                    "task": self.task,
-                    "auth": self.api_key
-                }
-            )
-        )
+        ws.send(self.auth_message)
 
-    @staticmethod
-    def convert_bytes_to_float(audio_bytes):
+    def convert_bytes_to_float(self, audio_bytes):
         """
         Converts byte audio data to a float array.
+
+        The cast and scale happen in a single pass into a buffer that is reused across calls, so
+        the returned array is only valid until the next conversion.
         """
         raw_audio_data = np.frombuffer(audio_bytes, dtype=np.int16)
-        return raw_audio_data.astype(np.float32) / 32768.0
+        if self.float_audio_buffer.size < raw_audio_data.size:
+            self.float_audio_buffer = np.empty(raw_audio_data.size, dtype=np.float32)
+        float_audio_data = self.float_audio_buffer[:raw_audio_data.size]
+        np.multiply(raw_audio_data, np.float32(1.0 / 32768.0), out=float_audio_data)
+        return float_audio_data
 
     def stream_audio_packet(self, audio_packet):
         """
@@ -332,8 +519,12 @@ class Client:
 
                 audio_file.close()
                 assert self.last_server_response_time
-                while time.time() - self.last_server_response_time < self.timeout_duration:
-                    continue
+                # wait until the server has been silent for timeout_duration or the connection closes
+                while not self.closed_event.is_set():
+                    remaining = self.timeout_duration - (time.perf_counter() - self.last_server_response_time)
+                    if remaining <= 0:
+                        break
+                    self.closed_event.wait(remaining)
                 self.audio_stream.close()
                 self.close_websocket_connection()
 
@@ -341,7 +532,7 @@ class Client:
                 audio_file.close()
                 self.audio_stream.stop_stream()
                 self.audio_stream.close()
-                self.pyaudio_instance.terminate()
+                _release_pyaudio()
                 self.close_websocket_connection()
                 print("[INFO]: Recording stopped.")
 
@@ -393,21 +584,33 @@ class TranscriptionClient:
 
         Initiates the transcription process by connecting to the server via a WebSocket. It waits for the server
         to be ready to receive audio data and then sends audio for transcription. If an audio file is provided, it
-        will be played and streamed to the server; otherwise, it will perform live recording.
+        is resampled before waiting on the server, then played and streamed to the server; otherwise, it will
+        perform live recording.
 
         Args:
             audio (str, optional): Path to an audio file for transcription. Default is None, which triggers live recording.
 
         """
+        resampled_file = None
+        if audio is not None:
+            # Decode the file while the server handshake completes, failing fast on unreadable input
+            try:
+                resampled_file = resample_audio(audio)
+            except BaseException:
+                self.client.close_websocket_connection()
+                raise
+
         print("[INFO]: Waiting for server ready ...")
-        while not self.client.is_recording:
-            if self.client.is_waiting:
-                self.client.close_websocket()
+        while not self.client.ready_event.wait(timeout=0.1):
+            if self.client.wait_event.is_set():
+                self.client.close_websocket_connection()
+                return
+            if self.client.closed_event.is_set():
+                print("[ERROR]: Connection closed before the server was ready.")
+                self.client.close_websocket_connection()
                 return
-            pass
         print("[INFO]: Server Ready!")
-        if audio is not None:
-            resampled_file = resample_audio(audio)
+        if resampled_file is not None:
             self.client.play_and_stream_audio(resampled_file)
         else:
             self.client.record()